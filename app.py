@@ -1,9 +1,9 @@
 import streamlit as st
-import re
 import sys
 import asyncio
 import warnings
-from playwright.sync_api import sync_playwright
+from browser_supervisor import BrowserSupervisor, extract_many, suggest
+from tag_normalizer import build_variant_index, merge_variants
 
 # ✅ Playwright subprocess fix for Windows + Python 3.14
 # ✅ Hide deprecation warning safely
@@ -156,78 +156,29 @@ if "compare_select_all" not in st.session_state:
 if "recommended_tags" not in st.session_state:
     st.session_state.recommended_tags = []
 
+if "merge_variants" not in st.session_state:
+    st.session_state.merge_variants = False
+
+# merge setting the stored results were extracted with
+if "results_merged" not in st.session_state:
+    st.session_state.results_merged = False
+
+if "browser_workers" not in st.session_state:
+    st.session_state.browser_workers = 1
+
+# ✅ NEW: browser restarts / memory from the last run
+if "browser_stats" not in st.session_state:
+    st.session_state.browser_stats = []
+
+if "browser_unstarted_failures" not in st.session_state:
+    st.session_state.browser_unstarted_failures = 0
+
 # -----------------------------
 # Helpers
 # -----------------------------
-def normalize_tag(t: str) -> str:
-    t = str(t).strip().lower()
-    t = re.sub(r"\s+", " ", t)
-    t = re.sub(r"[^\w\s]", "", t)
-    t = t.strip()
-    if not t:
-        return ""
-    return "#" + t
-
 def strip_hash(tag: str) -> str:
     return tag[1:] if tag.startswith("#") else tag
 
-def unique_order(items):
-    seen = set()
-    out = []
-    for x in items:
-        k = x.lower().strip()
-        if k and k not in seen:
-            seen.add(k)
-            out.append(x)
-    return out
-
-def clean_title(title: str) -> str:
-    if not title:
-        return "(no title)"
-    title = re.sub(r"\s*-\s*Find\s*&\s*Share\s*on\s*GIPHY\s*$", "", title, flags=re.IGNORECASE)
-    title = re.sub(r"\s*-\s*GIPHY\s*$", "", title, flags=re.IGNORECASE)
-    return title.strip()
-
-def get_channel_from_title(title: str):
-    if not title:
-        return "(no channel)"
-    matches = re.findall(r"\bby\s+([^-\n]+)", title, flags=re.IGNORECASE)
-    return matches[-1].strip() if matches else "(no channel)"
-
-def get_views(page):
-    try:
-        txt = page.inner_text("body")
-        m = re.search(r"([\d,]+)\s+Views", txt, re.IGNORECASE)
-        return m.group(1).strip() if m else "N/A"
-    except Exception:
-        return "N/A"
-
-def get_preview_image(page):
-    try:
-        img = page.evaluate("() => document.querySelector(\"meta[property='og:image']\")?.content || ''")
-        if img:
-            return img
-    except Exception:
-        pass
-    try:
-        img = page.evaluate("() => document.querySelector(\"meta[name='twitter:image']\")?.content || ''")
-        if img:
-            return img
-    except Exception:
-        pass
-    try:
-        img = page.evaluate("""
-        () => {
-          const imgs = Array.from(document.querySelectorAll("img"))
-            .map(i => i.getAttribute("src") || "")
-            .filter(src => src.includes("media") || src.includes("giphy"));
-          return imgs.length ? imgs[0] : "";
-        }
-        """)
-        return img or ""
-    except Exception:
-        return ""
-
 
 # -----------------------------
 # ✅ Smart Recommended Tag Builder
@@ -265,173 +216,11 @@ def build_recommended_tags(results, suggested_tags, top_n=20):
     # sort by score desc
     sorted_tags = sorted(scores.items(), key=lambda x: x[1], reverse=True)
 
+    # dict keys are already normalized + unique
     recommended = [t for t, _ in sorted_tags]
-    recommended = unique_order(recommended)
 
     return recommended[:top_n]
 
-# -----------------------------
-# Extract tags cluster + click ...
-# -----------------------------
-def extract_tag_chip_cluster(page):
-    data = page.evaluate("""
-    () => {
-      const bad = [
-        "copy link","download","favorite","embed","report","share","views","open on giphy",
-        "related","more like this",
-        "gifs","stickers","clips",
-        "manage cookies","cookies","cookie","agree","reject","accept",
-        "privacy","terms","settings",
-        "sign up","log in","login","signup",
-        "upload","create","browse","developers","apps"
-      ];
-
-      const els = Array.from(document.querySelectorAll("a, button, span, div"));
-
-      const chips = els.map(e => {
-        const txt = (e.innerText || "").trim();
-        const r = e.getBoundingClientRect();
-        return { txt, x:r.left, y:r.top, w:r.width, h:r.height };
-      })
-      .filter(o => o.txt && o.txt.length >= 1 && o.txt.length <= 35)
-      .filter(o => o.w >= 25 && o.w <= 280 && o.h >= 16 && o.h <= 80)
-      .filter(o => !bad.some(b => o.txt.toLowerCase().includes(b)));
-
-      if (!chips.length) return { tags: [], hasMore: false };
-
-      chips.sort((a,b)=>a.y-b.y);
-
-      const clusters = [];
-      let current = [];
-      for (const c of chips) {
-        if (!current.length) { current=[c]; continue; }
-        if (Math.abs(c.y - current[current.length-1].y) < 90) current.push(c);
-        else { clusters.push(current); current=[c]; }
-      }
-      if (current.length) clusters.push(current);
-
-      function scoreCluster(cluster) {
-        const s = new Set(cluster.map(o => o.txt.toLowerCase().trim()));
-        return s.size;
-      }
-
-      clusters.sort((a,b)=>scoreCluster(b)-scoreCluster(a));
-      const best = clusters[0] || [];
-
-      const seen = new Set();
-      const tags = [];
-      for (const b of best) {
-        const k = b.txt.toLowerCase().trim();
-        if (seen.has(k)) continue;
-        seen.add(k);
-        tags.push(b.txt);
-      }
-
-      const hasMore = tags.includes("...") || tags.includes("…");
-      return { tags, hasMore };
-    }
-    """)
-    return data.get("tags", []), data.get("hasMore", False)
-
-def click_more_chip_if_present(page):
-    for t in ["...", "…"]:
-        loc = page.locator(f"text={t}").first
-        try:
-            if loc.count() > 0:
-                loc.click(timeout=2000)
-                return True
-        except Exception:
-            pass
-    return False
-
-# -----------------------------
-# Browser launch helper (stable)
-# -----------------------------
-def launch_browser(pw):
-    return pw.chromium.launch(
-        headless=True,
-        args=[
-            "--no-sandbox",
-            "--disable-setuid-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-gpu",
-            "--no-zygote",
-            "--single-process",
-        ],
-    )
-
-# -----------------------------
-# Suggestion Scraper (NO API)
-# -----------------------------
-def scrape_search_suggestions(keyword: str):
-    keyword = (keyword or "").strip()
-    if not keyword:
-        return []
-
-    search_url = f"https://giphy.com/search/{keyword.replace(' ', '-')}"
-    with sync_playwright() as pw:
-        browser = launch_browser(pw)
-        page = browser.new_page()
-        page.goto(search_url, wait_until="networkidle", timeout=70000)
-        page.wait_for_timeout(1500)
-
-        suggested = page.evaluate("""
-        () => {
-          const bad = ["gifs","stickers","clips"];
-          const chips = Array.from(document.querySelectorAll("a[href^='/search/']"))
-            .map(a => (a.innerText || '').trim())
-            .filter(t => t && t.length > 1 && t.length <= 35)
-            .filter(t => !bad.includes(t.toLowerCase().trim()));
-          return chips;
-        }
-        """)
-        browser.close()
-
-    suggested = unique_order(suggested)
-    return unique_order([normalize_tag(t) for t in suggested if t])[:40]
-
-# -----------------------------
-# GIF extractor
-# -----------------------------
-def extract_giphy_info(url: str):
-    with sync_playwright() as pw:
-        browser = launch_browser(pw)
-        page = browser.new_page()
-
-        page.goto(url, wait_until="networkidle", timeout=70000)
-        page.wait_for_timeout(1500)
-
-        raw_title = page.title()
-        title = clean_title(raw_title)
-        channel = get_channel_from_title(raw_title)
-        views = get_views(page)
-        preview = get_preview_image(page)
-
-        page.mouse.wheel(0, 4200)
-        page.wait_for_timeout(1800)
-
-        tags_before, has_more = extract_tag_chip_cluster(page)
-
-        if has_more:
-            click_more_chip_if_present(page)
-            page.wait_for_timeout(1800)
-
-        tags_after, _ = extract_tag_chip_cluster(page)
-
-        browser.close()
-
-        tags_after = unique_order([t for t in tags_after if t and t.strip() and t.strip() not in ["...", "…"]])
-        tags = unique_order([normalize_tag(t) for t in tags_after if normalize_tag(t)])
-
-        return {
-            "title": title,
-            "channel": channel,
-            "views": views,
-            "preview": preview,
-            "tags": tags,
-            "url": url
-        }
-
 # -----------------------------
 # Header
 # -----------------------------
@@ -465,6 +254,18 @@ with col2:
 
 st.markdown("<div style='height:12px;'></div>", unsafe_allow_html=True)
 
+st.session_state.merge_variants = st.checkbox(
+    "🔗 Merge tag variants (#newyear / #new year / #new years)",
+    value=st.session_state.merge_variants
+)
+
+st.session_state.browser_workers = st.number_input(
+    "🧭 Parallel browsers (more = faster, more memory)",
+    min_value=1,
+    max_value=8,
+    value=st.session_state.browser_workers
+)
+
 run_extract = st.button("🚀 Extract Tags from GIF Links", type="primary")
 
 st.markdown("</div>", unsafe_allow_html=True)
@@ -479,18 +280,31 @@ if run_extract:
     if not urls:
         st.error("Please paste at least one GIPHY link.")
     else:
-        results = []
-        all_sets = []
         progress = st.progress(0)
 
-        for i, url in enumerate(urls):
-            with st.spinner(f"Processing {i+1}/{len(urls)}..."):
-                info = extract_giphy_info(url)
-                results.append(info)
-                all_sets.append(set(info["tags"]))
-            progress.progress(int(((i+1)/len(urls))*100))
+        def on_done(done, total):
+            progress.progress(int((done/total)*100), text=f"Processed {done}/{total}")
+
+        with st.spinner(f"Processing {len(urls)} GIFs..."):
+            with BrowserSupervisor(workers=st.session_state.browser_workers) as supervisor:
+                results = extract_many(urls, supervisor, on_done=on_done)
+            st.session_state.browser_stats = supervisor.stats()
+            st.session_state.browser_unstarted_failures = supervisor.unstarted_failures
+
+        if st.session_state.merge_variants:
+            index = build_variant_index([r["tags"] for r in results])
+            for r in results:
+                r["tags"] = merge_variants(r["tags"], index)
+
+        # failed pages have no tags and would empty the intersection
+        all_sets = [set(r["tags"]) for r in results if not r.get("error")]
+
+        failed = [r for r in results if r.get("error")]
+        if failed:
+            st.warning(f"{len(failed)} of {len(results)} GIFs could not be loaded and were skipped for common tags.")
 
         st.session_state.results = results
+        st.session_state.results_merged = st.session_state.merge_variants
         st.session_state.common_tags = sorted(list(set.intersection(*all_sets))) if all_sets else []
 
         # reset compare selections after new extraction
@@ -502,7 +316,25 @@ if run_suggest:
         st.error("Enter a keyword first.")
     else:
         with st.spinner("Searching suggested tags on GIPHY..."):
-            st.session_state.suggested_tags = scrape_search_suggestions(st.session_state.keyword)
+            with BrowserSupervisor() as supervisor:
+                suggested, error = suggest(st.session_state.keyword, supervisor)
+        if error:
+            st.error(f"Could not load suggested tags: {error}")
+        else:
+            st.session_state.suggested_tags = suggested
+
+# -----------------------------
+# Display: Browser stats (host sizing)
+# -----------------------------
+for b in st.session_state.browser_stats:
+    mem = f"{b['memory_mb']} MB (peak {b['peak_memory_mb']} MB)" if b["memory_mb"] is not None else "N/A"
+    st.caption(
+        f"🧯 Browser {b['browser']}: {b['restarts']} restarts · {b['pages']} pages · "
+        f"{b['retries']} retries · {b['failures']} failed URLs · memory {mem}"
+    )
+
+if st.session_state.browser_unstarted_failures:
+    st.caption(f"🧯 {st.session_state.browser_unstarted_failures} failed URLs (no browser could launch)")
 
 # -----------------------------
 # Display: Common Tags (ALL GIFS)
@@ -519,13 +351,16 @@ if st.session_state.common_tags:
 # -----------------------------
 # ✅ Compare Selected GIFs + Common Tags + Tag Frequency (Selected vs All)
 # -----------------------------
-if st.session_state.results and len(st.session_state.results) > 1:
+# failed pages have no tags -> keep them out of comparisons and frequency totals
+loaded_indexes = [i for i, r in enumerate(st.session_state.results) if not r.get("error")]
+
+if len(loaded_indexes) > 1:
     st.markdown("---")
     st.markdown("<div style='height:3px;'></div>", unsafe_allow_html=True)
     st.markdown("<div class='section-title'>🔍 Compare Selected GIFs</div>", unsafe_allow_html=True)
 
     # ✅ Indexed titles for dropdown
-    titles = [f"{i+1}. {r['title']}" for i, r in enumerate(st.session_state.results)]
+    titles = [f"{i+1}. {st.session_state.results[i]['title']}" for i in loaded_indexes]
 
     # ✅ Select all checkbox
     select_all = st.checkbox("Select All GIFs or Compare", value=st.session_state.compare_select_all)
@@ -542,7 +377,7 @@ if st.session_state.results and len(st.session_state.results) > 1:
         st.session_state.compare_selected = selected_titles
 
     # Convert selected titles to indexes
-    selected_indexes = [titles.index(t) for t in selected_titles] if selected_titles else []
+    selected_indexes = [loaded_indexes[titles.index(t)] for t in selected_titles] if selected_titles else []
 
     # ✅ Common tags for selected GIFs
     if len(selected_indexes) >= 2:
@@ -574,7 +409,7 @@ if st.session_state.results and len(st.session_state.results) > 1:
 
     # Decide which set to use
     if mode == "All GIFs":
-        indexes_for_freq = list(range(len(st.session_state.results)))
+        indexes_for_freq = loaded_indexes
     else:
         indexes_for_freq = selected_indexes
 
@@ -637,9 +472,14 @@ if st.session_state.results:
 
 
     if run_recommend:
+        suggested_for_rec = st.session_state.suggested_tags
+        if st.session_state.results_merged:
+            index = build_variant_index([r["tags"] for r in st.session_state.results] + [suggested_for_rec])
+            suggested_for_rec = merge_variants(suggested_for_rec, index)
+
         st.session_state.recommended_tags = build_recommended_tags(
             st.session_state.results,
-            st.session_state.suggested_tags,
+            suggested_for_rec,
             top_n=20
         )
 
@@ -682,6 +522,8 @@ if st.session_state.results:
                 f"<span class='badge badge-purple'>{len(item['tags'])} Tags</span>",
                 unsafe_allow_html=True
             )
+            if item.get("error"):
+                st.error(f"Failed to load: {item['error']}")
             # st.markdown("#### Tags")
             if item["tags"]:
                 st.markdown("".join([f"<span class='tag-chip'>{t}</span>" for t in item["tags"]]), unsafe_allow_html=True)
@@ -0,0 +1,305 @@
+import sys
+import time
+import asyncio
+import warnings
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+from giphy_scraper import launch_browser, extract_giphy_info, scrape_search_suggestions, failed_result
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+JOBS = {
+    "extract": extract_giphy_info,
+    "suggest": scrape_search_suggestions,
+}
+
+# -----------------------------
+# Worker process (one browser each)
+# -----------------------------
+def _worker_main(conn):
+    # ✅ Same Windows fix as app.py (spawned workers don't inherit it)
+    if sys.platform.startswith("win"):
+        warnings.filterwarnings("ignore", category=DeprecationWarning)
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+    from playwright.sync_api import sync_playwright
+
+    # report launch problems (e.g. Chromium not installed) instead of dying silently
+    try:
+        pw = sync_playwright().start()
+        browser = launch_browser(pw)
+    except Exception as e:
+        conn.send(("launch_error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", None))
+
+    try:
+        while True:
+            job = conn.recv()
+            if job is None:
+                break
+            kind, arg = job
+            try:
+                conn.send(("ok", JOBS[kind](browser, arg)))
+            except Exception as e:
+                # --single-process: a renderer crash kills the whole browser
+                if not browser.is_connected():
+                    conn.send(("crashed", f"{type(e).__name__}: {e}"))
+                    return
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+
+        browser.close()
+    finally:
+        pw.stop()
+
+def process_tree_rss_mb(pid):
+    if psutil is None:
+        return None
+    try:
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(recursive=True)
+        total = 0
+        for p in procs:
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass
+        return round(total / (1024 * 1024), 1)
+    except psutil.Error:
+        return None
+
+def kill_process_children(pid):
+    # Playwright driver + Chromium run under the worker; killing only the worker
+    # can leave a wedged browser behind. Without psutil the driver still exits
+    # once its stdin closes.
+    if psutil is None:
+        return
+    try:
+        children = psutil.Process(pid).children(recursive=True)
+    except psutil.Error:
+        return
+    for c in children:
+        try:
+            c.kill()
+        except psutil.Error:
+            pass
+
+# -----------------------------
+# Supervisor
+# -----------------------------
+class BrowserSupervisor:
+    """
+    Runs scraping jobs in isolated browser worker processes.
+    - hard deadline per page (kills the worker, even inside evaluate)
+    - dead/hung browsers are relaunched automatically
+    - only a job that crashed or hung its browser is re-queued (max_attempts in total);
+      ordinary page errors fail straight away
+    - a browser that fails to launch max_launch_failures times in a row is retired;
+      the rest keep going, jobs only fail when no browser can launch
+    """
+
+    def __init__(self, workers=1, page_timeout=90.0, launch_timeout=60.0, max_attempts=2, max_launch_failures=3):
+        self.workers = max(1, int(workers))
+        self.page_timeout = page_timeout
+        self.launch_timeout = launch_timeout
+        self.max_attempts = max_attempts
+        self.max_launch_failures = max_launch_failures
+        # URLs failed because no browser could launch (not owned by any slot)
+        self.unstarted_failures = 0
+        self._ctx = mp.get_context("spawn")
+        self._slots = [
+            {"proc": None, "conn": None, "ready": False, "job": None, "deadline": 0.0,
+             "launch_failures": 0, "retired": False,
+             "launches": 0, "pages": 0, "retries": 0, "failures": 0, "memory_mb": None, "peak_memory_mb": None}
+            for _ in range(self.workers)
+        ]
+
+    # ---- worker lifecycle ----
+    def _start(self, slot):
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        proc.start()
+        child_conn.close()
+        slot.update(proc=proc, conn=parent_conn, ready=False, job=None,
+                    deadline=time.monotonic() + self.launch_timeout)
+        slot["launches"] += 1
+
+    def _kill(self, slot):
+        proc, conn = slot["proc"], slot["conn"]
+        if conn is not None:
+            conn.close()
+        if proc is not None and proc.is_alive():
+            kill_process_children(proc.pid)
+            proc.kill()
+        if proc is not None:
+            proc.join(timeout=5)
+        slot.update(proc=None, conn=None, ready=False, job=None)
+
+    def _sample_memory(self, slot):
+        if slot["proc"] is None:
+            return
+        mb = process_tree_rss_mb(slot["proc"].pid)
+        slot["memory_mb"] = mb
+        if mb is not None and (slot["peak_memory_mb"] is None or mb > slot["peak_memory_mb"]):
+            slot["peak_memory_mb"] = mb
+
+    def close(self):
+        for slot in self._slots:
+            if slot["conn"] is not None and slot["proc"].is_alive() and slot["job"] is None:
+                try:
+                    slot["conn"].send(None)
+                    slot["proc"].join(timeout=10)
+                except (OSError, EOFError):
+                    pass
+            self._kill(slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- stats ----
+    def stats(self):
+        return [
+            {
+                "browser": i + 1,
+                "restarts": max(0, s["launches"] - 1),
+                "pages": s["pages"],
+                "retries": s["retries"],
+                "failures": s["failures"],
+                "memory_mb": s["memory_mb"],
+                "peak_memory_mb": s["peak_memory_mb"],
+            }
+            for i, s in enumerate(self._slots)
+        ]
+
+    # ---- main loop ----
+    def run(self, jobs, on_done=None):
+        """
+        jobs: list of (kind, arg).
+        Returns ("ok", value) or ("error", reason) per job, in the same order.
+        """
+        results = [None] * len(jobs)
+        attempts = [0] * len(jobs)
+        pending = list(range(len(jobs)))
+        pending.reverse()
+        done = 0
+
+        for slot in self._slots:
+            slot.update(launch_failures=0, retired=False)
+
+        def finish(idx, value):
+            nonlocal done
+            results[idx] = value
+            done += 1
+            if on_done:
+                on_done(done, len(jobs))
+
+        def fail(slot, idx, reason):
+            # no in-flight job (idle exit, launch failure) -> counted as a restart only
+            if idx is None:
+                return
+            if attempts[idx] >= self.max_attempts:
+                slot["failures"] += 1
+                finish(idx, ("error", reason))
+            else:
+                slot["retries"] += 1
+                pending.append(idx)
+
+        def crash(slot, reason):
+            # dead or hung browser -> kill, re-queue in-flight job, relaunch on next loop
+            idx = slot["job"]
+            if not slot["ready"]:
+                slot["launch_failures"] += 1
+                if slot["launch_failures"] >= self.max_launch_failures:
+                    slot["retired"] = True
+            self._kill(slot)
+            fail(slot, idx, reason)
+
+            # no browser can start at all -> give up instead of relaunching forever
+            if all(s["retired"] for s in self._slots):
+                while pending:
+                    self.unstarted_failures += 1
+                    finish(pending.pop(), ("error", reason))
+
+        while done < len(jobs):
+            now = time.monotonic()
+
+            for slot in self._slots:
+                if slot["proc"] is None:
+                    if pending and not slot["retired"]:
+                        self._start(slot)
+                    continue
+
+                # unread messages first (e.g. launch_error sent right before exit)
+                if not slot["proc"].is_alive() and not slot["conn"].poll():
+                    crash(slot, f"browser process exited (code {slot['proc'].exitcode})")
+                elif now > slot["deadline"] and (slot["job"] is not None or not slot["ready"]):
+                    crash(slot, "page timed out" if slot["ready"] else "browser launch timed out")
+                elif slot["ready"] and slot["job"] is None and pending:
+                    idx = pending.pop()
+                    attempts[idx] += 1
+                    try:
+                        slot["conn"].send(jobs[idx])
+                    except (OSError, EOFError):
+                        pending.append(idx)
+                        attempts[idx] -= 1
+                        continue
+                    slot["job"] = idx
+                    slot["deadline"] = now + self.page_timeout
+
+            conns = [s["conn"] for s in self._slots if s["conn"] is not None]
+            if not conns:
+                continue
+
+            for conn in wait(conns, timeout=0.5):
+                slot = next(s for s in self._slots if s["conn"] is conn)
+                try:
+                    kind, payload = conn.recv()
+                except (OSError, EOFError):
+                    slot["proc"].join(timeout=1)
+                    crash(slot, f"browser process exited (code {slot['proc'].exitcode})")
+                    continue
+
+                if kind == "ready":
+                    slot["ready"] = True
+                    slot["launch_failures"] = 0
+                elif kind == "launch_error":
+                    crash(slot, f"browser launch failed: {payload}")
+                    continue
+                elif kind == "ok":
+                    slot["pages"] += 1
+                    idx = slot["job"]
+                    slot["job"] = None
+                    finish(idx, ("ok", payload))
+                elif kind == "error":
+                    # same page would fail the same way again -> no retry
+                    idx = slot["job"]
+                    slot["job"] = None
+                    slot["failures"] += 1
+                    finish(idx, ("error", payload))
+                elif kind == "crashed":
+                    crash(slot, payload)
+                    continue
+                self._sample_memory(slot)
+
+        return results
+
+# -----------------------------
+# Convenience wrappers
+# -----------------------------
+def extract_many(urls, supervisor, on_done=None):
+    out = []
+    for url, (status, value) in zip(urls, supervisor.run([("extract", u) for u in urls], on_done=on_done)):
+        out.append(value if status == "ok" else failed_result(url, value))
+    return out
+
+def suggest(keyword, supervisor):
+    """Returns (tags, error); error is None on success."""
+    status, value = supervisor.run([("suggest", keyword)])[0]
+    return (value, None) if status == "ok" else ([], value)
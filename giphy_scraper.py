@@ -0,0 +1,227 @@
+import re
+from tag_normalizer import normalize_tags
+
+# -----------------------------
+# Page helpers
+# -----------------------------
+def clean_title(title: str) -> str:
+    if not title:
+        return "(no title)"
+    title = re.sub(r"\s*-\s*Find\s*&\s*Share\s*on\s*GIPHY\s*$", "", title, flags=re.IGNORECASE)
+    title = re.sub(r"\s*-\s*GIPHY\s*$", "", title, flags=re.IGNORECASE)
+    return title.strip()
+
+def get_channel_from_title(title: str):
+    if not title:
+        return "(no channel)"
+    matches = re.findall(r"\bby\s+([^-\n]+)", title, flags=re.IGNORECASE)
+    return matches[-1].strip() if matches else "(no channel)"
+
+def get_views(page):
+    try:
+        txt = page.inner_text("body")
+        m = re.search(r"([\d,]+)\s+Views", txt, re.IGNORECASE)
+        return m.group(1).strip() if m else "N/A"
+    except Exception:
+        return "N/A"
+
+def get_preview_image(page):
+    try:
+        img = page.evaluate("() => document.querySelector(\"meta[property='og:image']\")?.content || ''")
+        if img:
+            return img
+    except Exception:
+        pass
+    try:
+        img = page.evaluate("() => document.querySelector(\"meta[name='twitter:image']\")?.content || ''")
+        if img:
+            return img
+    except Exception:
+        pass
+    try:
+        img = page.evaluate("""
+        () => {
+          const imgs = Array.from(document.querySelectorAll("img"))
+            .map(i => i.getAttribute("src") || "")
+            .filter(src => src.includes("media") || src.includes("giphy"));
+          return imgs.length ? imgs[0] : "";
+        }
+        """)
+        return img or ""
+    except Exception:
+        return ""
+
+# -----------------------------
+# Extract tags cluster + click ...
+# -----------------------------
+def extract_tag_chip_cluster(page):
+    data = page.evaluate("""
+    () => {
+      const bad = [
+        "copy link","download","favorite","embed","report","share","views","open on giphy",
+        "related","more like this",
+        "gifs","stickers","clips",
+        "manage cookies","cookies","cookie","agree","reject","accept",
+        "privacy","terms","settings",
+        "sign up","log in","login","signup",
+        "upload","create","browse","developers","apps"
+      ];
+
+      const els = Array.from(document.querySelectorAll("a, button, span, div"));
+
+      const chips = els.map(e => {
+        const txt = (e.innerText || "").trim();
+        const r = e.getBoundingClientRect();
+        return { txt, x:r.left, y:r.top, w:r.width, h:r.height };
+      })
+      .filter(o => o.txt && o.txt.length >= 1 && o.txt.length <= 35)
+      .filter(o => o.w >= 25 && o.w <= 280 && o.h >= 16 && o.h <= 80)
+      .filter(o => !bad.some(b => o.txt.toLowerCase().includes(b)));
+
+      if (!chips.length) return { tags: [], hasMore: false };
+
+      chips.sort((a,b)=>a.y-b.y);
+
+      const clusters = [];
+      let current = [];
+      for (const c of chips) {
+        if (!current.length) { current=[c]; continue; }
+        if (Math.abs(c.y - current[current.length-1].y) < 90) current.push(c);
+        else { clusters.push(current); current=[c]; }
+      }
+      if (current.length) clusters.push(current);
+
+      function scoreCluster(cluster) {
+        const s = new Set(cluster.map(o => o.txt.toLowerCase().trim()));
+        return s.size;
+      }
+
+      clusters.sort((a,b)=>scoreCluster(b)-scoreCluster(a));
+      const best = clusters[0] || [];
+
+      const seen = new Set();
+      const tags = [];
+      for (const b of best) {
+        const k = b.txt.toLowerCase().trim();
+        if (seen.has(k)) continue;
+        seen.add(k);
+        tags.push(b.txt);
+      }
+
+      const hasMore = tags.includes("...") || tags.includes("…");
+      return { tags, hasMore };
+    }
+    """)
+    return data.get("tags", []), data.get("hasMore", False)
+
+def click_more_chip_if_present(page):
+    for t in ["...", "…"]:
+        loc = page.locator(f"text={t}").first
+        try:
+            if loc.count() > 0:
+                loc.click(timeout=2000)
+                return True
+        except Exception:
+            pass
+    return False
+
+# -----------------------------
+# Browser launch helper (stable)
+# -----------------------------
+def launch_browser(pw):
+    return pw.chromium.launch(
+        headless=True,
+        args=[
+            "--no-sandbox",
+            "--disable-setuid-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--no-zygote",
+            "--single-process",
+        ],
+    )
+
+# -----------------------------
+# Suggestion Scraper (NO API)
+# -----------------------------
+def scrape_search_suggestions(browser, keyword: str):
+    keyword = (keyword or "").strip()
+    if not keyword:
+        return []
+
+    search_url = f"https://giphy.com/search/{keyword.replace(' ', '-')}"
+    page = browser.new_page()
+    try:
+        page.goto(search_url, wait_until="networkidle", timeout=70000)
+        page.wait_for_timeout(1500)
+
+        suggested = page.evaluate("""
+        () => {
+          const bad = ["gifs","stickers","clips"];
+          const chips = Array.from(document.querySelectorAll("a[href^='/search/']"))
+            .map(a => (a.innerText || '').trim())
+            .filter(t => t && t.length > 1 && t.length <= 35)
+            .filter(t => !bad.includes(t.toLowerCase().trim()));
+          return chips;
+        }
+        """)
+    finally:
+        try:
+            page.close()
+        except Exception:
+            pass
+
+    return normalize_tags(suggested)[:40]
+
+# -----------------------------
+# GIF extractor
+# -----------------------------
+def extract_giphy_info(browser, url: str):
+    page = browser.new_page()
+    try:
+        page.goto(url, wait_until="networkidle", timeout=70000)
+        page.wait_for_timeout(1500)
+
+        raw_title = page.title()
+        title = clean_title(raw_title)
+        channel = get_channel_from_title(raw_title)
+        views = get_views(page)
+        preview = get_preview_image(page)
+
+        page.mouse.wheel(0, 4200)
+        page.wait_for_timeout(1800)
+
+        tags_before, has_more = extract_tag_chip_cluster(page)
+
+        if has_more:
+            click_more_chip_if_present(page)
+            page.wait_for_timeout(1800)
+
+        tags_after, _ = extract_tag_chip_cluster(page)
+    finally:
+        try:
+            page.close()
+        except Exception:
+            pass
+
+    tags = normalize_tags([t for t in tags_after if t and t.strip() not in ["...", "…"]])
+
+    return {
+        "title": title,
+        "channel": channel,
+        "views": views,
+        "preview": preview,
+        "tags": tags,
+        "url": url
+    }
+
+def failed_result(url: str, reason: str):
+    return {
+        "title": "(failed to load)",
+        "channel": "(no channel)",
+        "views": "N/A",
+        "preview": "",
+        "tags": [],
+        "url": url,
+        "error": reason
+    }
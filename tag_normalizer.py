@@ -0,0 +1,96 @@
+import re
+from functools import lru_cache
+
+# -----------------------------
+# Precompiled rules
+# -----------------------------
+_WS_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+NORMALIZE_CACHE_SIZE = 8192
+
+# -----------------------------
+# Single tag + batch normalization
+# -----------------------------
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize(t: str) -> str:
+    t = t.strip().lower()
+    t = _WS_RE.sub(" ", t)
+    t = _PUNCT_RE.sub("", t)
+    t = t.strip()
+    if not t:
+        return ""
+    return "#" + t
+
+def normalize_tag(t) -> str:
+    return _normalize(str(t))
+
+def normalize_tags(items):
+    """
+    Normalizes a whole list in one pass.
+    Drops empty results and duplicates, keeps first-seen order.
+    """
+    seen = set()
+    out = []
+    for x in items:
+        if not x:
+            continue
+        t = _normalize(str(x))
+        if t and t not in seen:
+            seen.add(t)
+            out.append(t)
+    return out
+
+# -----------------------------
+# Variant merging (#newyear / #new year / #new years)
+# -----------------------------
+def _is_plural(word: str) -> bool:
+    return len(word) > 3 and word.endswith("s") and not word.endswith("ss")
+
+def variant_key(tag: str, spaced_keys=()) -> str:
+    """
+    Space-insensitive key for a tag.
+    A trailing plural "s" is only dropped for the last word of a multi-word tag
+    (#new years), or when the singular is a spaced tag in the corpus (#newyears
+    next to #new year) - so #news / #new or #goods / #good stay apart.
+    """
+    body = tag[1:] if tag.startswith("#") else tag
+    words = body.split(" ")
+    k = "".join(words).replace("_", "")
+    if _is_plural(words[-1]) and (len(words) > 1 or k[:-1] in spaced_keys):
+        k = k[:-1]
+    return k
+
+def build_variant_index(tag_lists):
+    """
+    Maps every normalized tag to one canonical form per variant group.
+    Canonical = most used form across all lists (first seen wins ties).
+    """
+    counts = {}
+    order = {}
+    for tags in tag_lists:
+        for t in tags:
+            counts[t] = counts.get(t, 0) + 1
+            if t not in order:
+                order[t] = len(order)
+
+    spaced_keys = {variant_key(t) for t in counts if " " in t}
+    keys = {t: variant_key(t, spaced_keys) for t in counts}
+
+    best = {}
+    for t, k in keys.items():
+        cur = best.get(k)
+        if cur is None or counts[t] > counts[cur] or (counts[t] == counts[cur] and order[t] < order[cur]):
+            best[k] = t
+
+    return {t: best[k] for t, k in keys.items()}
+
+def merge_variants(tags, index):
+    seen = set()
+    out = []
+    for t in tags:
+        c = index.get(t, t)
+        if c not in seen:
+            seen.add(c)
+            out.append(c)
+    return out
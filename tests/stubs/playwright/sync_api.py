@@ -0,0 +1,107 @@
+"""
+Stand-in for playwright.sync_api used by tests/test_browser_supervisor.py.
+
+Page behaviour is picked by the URL prefix:
+- hang...   never returns
+- crash...  kills the worker process (first time only)
+- dc...     browser disconnects under the page (first time only)
+- boom...   raises an ordinary exception
+- slow...   takes half a second
+Launches after STUB_OK_LAUNCHES fail with "out of memory".
+"""
+import os
+import time
+import itertools
+
+
+def _first_time(name):
+    try:
+        os.close(os.open(os.path.join(os.environ["STUB_DIR"], name), os.O_CREAT | os.O_EXCL))
+        return True
+    except FileExistsError:
+        return False
+
+
+def _launch_number():
+    for i in itertools.count(1):
+        if _first_time(f"launch{i}"):
+            return i
+
+
+class _Mouse:
+    def wheel(self, *args):
+        pass
+
+
+class Page:
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = ""
+        self.mouse = _Mouse()
+
+    def goto(self, url, **kwargs):
+        self.url = url
+        if url.startswith("hang"):
+            time.sleep(3600)
+        if url.startswith("crash") and _first_time(url):
+            os._exit(3)
+        if url.startswith("dc") and _first_time(url):
+            self.browser.connected = False
+            raise RuntimeError("Target crashed")
+        if url.startswith("boom"):
+            raise RuntimeError("boom")
+        if url.startswith("slow"):
+            time.sleep(0.5)
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def title(self):
+        return f"{self.url} by Bob - GIPHY"
+
+    def inner_text(self, selector):
+        return "1,234 Views"
+
+    def evaluate(self, js, *args):
+        if "hasMore" in js:
+            return {"tags": ["Cat", "#cats", "..."], "hasMore": False}
+        return ""
+
+    def close(self):
+        if not self.browser.connected:
+            raise RuntimeError("Target closed")
+
+
+class Browser:
+    def __init__(self):
+        self.connected = True
+
+    def new_page(self):
+        return Page(self)
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        pass
+
+
+class _Chromium:
+    def launch(self, **kwargs):
+        if _launch_number() > int(os.environ.get("STUB_OK_LAUNCHES", "1000000")):
+            raise RuntimeError("out of memory")
+        return Browser()
+
+
+class _Playwright:
+    chromium = _Chromium()
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+
+def sync_playwright():
+    return _Playwright()
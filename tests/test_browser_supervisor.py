@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+# spawned workers inherit sys.path, so they import the stub Playwright too
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "stubs"))
+
+from browser_supervisor import BrowserSupervisor, extract_many  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def stub_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("STUB_DIR", str(tmp_path))
+    monkeypatch.delenv("STUB_OK_LAUNCHES", raising=False)
+
+
+def totals(supervisor):
+    stats = supervisor.stats()
+    return {k: sum(b[k] for b in stats) for k in ("restarts", "pages", "retries", "failures")}
+
+
+def run(urls, **kwargs):
+    with BrowserSupervisor(**kwargs) as supervisor:
+        results = extract_many(urls, supervisor)
+    return results, supervisor
+
+
+def test_results_in_input_order():
+    urls = ["slow0", "a1", "slow2", "a3", "a4"]
+    results, supervisor = run(urls, workers=2)
+    assert [r["url"] for r in results] == urls
+    assert [r["title"] for r in results] == [f"{u} by Bob" for u in urls]
+    assert all(r["tags"] == ["#cat", "#cats"] and "error" not in r for r in results)
+    assert totals(supervisor) == {"restarts": 0, "pages": 5, "retries": 0, "failures": 0}
+
+
+def test_hang_is_killed_and_retried_once():
+    results, supervisor = run(["hang", "a"], page_timeout=2)
+    assert results[0]["error"] == "page timed out"
+    assert "error" not in results[1]
+    assert totals(supervisor) == {"restarts": 2, "pages": 1, "retries": 1, "failures": 1}
+
+
+@pytest.mark.parametrize("url", ["crash", "dc"])
+def test_crash_is_requeued(url):
+    results, supervisor = run([url, "a"])
+    assert [r.get("error") for r in results] == [None, None]
+    assert totals(supervisor) == {"restarts": 1, "pages": 2, "retries": 1, "failures": 0}
+
+
+def test_page_error_is_not_retried():
+    results, supervisor = run(["boom", "a"])
+    assert results[0]["error"] == "RuntimeError: boom"
+    assert "error" not in results[1]
+    assert totals(supervisor) == {"restarts": 0, "pages": 1, "retries": 0, "failures": 1}
+
+
+def test_launch_error_is_reported(monkeypatch):
+    monkeypatch.setenv("STUB_OK_LAUNCHES", "0")
+    results, supervisor = run(["a", "b", "c"], workers=2, max_launch_failures=2)
+    assert [r["error"] for r in results] == ["browser launch failed: RuntimeError: out of memory"] * 3
+    assert supervisor.unstarted_failures == 3
+    assert [b["restarts"] for b in supervisor.stats()] == [1, 1]
+
+
+def test_failed_launch_retires_only_that_browser(monkeypatch):
+    # both first launches work, every relaunch fails
+    monkeypatch.setenv("STUB_OK_LAUNCHES", "2")
+    urls = ["hang"] + [f"slow{i}" for i in range(8)]
+    results, supervisor = run(urls, workers=2, page_timeout=2, max_attempts=1)
+    assert results[0]["error"] == "page timed out"
+    assert all("error" not in r for r in results[1:])
+    assert supervisor.unstarted_failures == 0
+    assert totals(supervisor) == {"restarts": 3, "pages": 8, "retries": 0, "failures": 1}
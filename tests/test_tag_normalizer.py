@@ -0,0 +1,46 @@
+from tag_normalizer import normalize_tag, normalize_tags, variant_key, build_variant_index, merge_variants
+
+
+def test_normalize_tag():
+    assert normalize_tag("  New   Year! ") == "#new year"
+    assert normalize_tag("#Cats") == "#cats"
+    assert normalize_tag("!!!") == ""
+    assert normalize_tag(42) == "#42"
+
+
+def test_normalize_tags_dedupes_and_keeps_order():
+    assert normalize_tags(["Cat", "", None, "#cat", "Dog!", "...", "dog"]) == ["#cat", "#dog"]
+
+
+def test_variant_key_spaces_and_plural_last_word():
+    assert variant_key("#new year") == "newyear"
+    assert variant_key("#newyear") == "newyear"
+    assert variant_key("#new years") == "newyear"
+    assert variant_key("#happy new_year") == "happynewyear"
+    assert variant_key("#glass") == "glass"
+
+
+def test_variant_key_single_word_plural_needs_spaced_singular():
+    assert variant_key("#newyears") == "newyears"
+    assert variant_key("#newyears", {"newyear"}) == "newyear"
+    assert variant_key("#news", {"newyear"}) == "news"
+
+
+def test_build_variant_index_merges_variants():
+    index = build_variant_index([["#newyear", "#new year"], ["#new years", "#newyear", "#newyears"]])
+    assert set(index.values()) == {"#newyear"}
+
+
+def test_build_variant_index_keeps_different_words_apart():
+    index = build_variant_index([["#new year", "#news"], ["#newyear", "#new"], ["#new years"]])
+    assert index["#new"] == "#new"
+    assert index["#news"] == "#news"
+    assert index["#new years"] == index["#new year"] == index["#newyear"]
+
+    index = build_variant_index([["#good", "#goods", "#arm"], ["#arms", "#good"]])
+    assert index == {"#good": "#good", "#goods": "#goods", "#arm": "#arm", "#arms": "#arms"}
+
+
+def test_merge_variants_dedupes_after_mapping():
+    index = {"#new year": "#newyear", "#newyear": "#newyear", "#cat": "#cat"}
+    assert merge_variants(["#new year", "#cat", "#newyear", "#dog"], index) == ["#newyear", "#cat", "#dog"]